@@ -1,12 +1,17 @@
+import logging
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import time
-from src.stream_manager import StreamManager
+from src.stream_manager import get_stream_manager
 from src.config import DEFAULT_SYMBOLS
 from src.analytics import FinancialMetrics
 
+# Logging is configured once at the entry point; library modules only
+# create their own `logging.getLogger(__name__)` and never basicConfig
+logging.basicConfig(level=logging.INFO)
+
 # --- Page Config ---
 st.set_page_config(
     page_title="Quant Analytics Pro",
@@ -26,12 +31,90 @@ st.markdown("""
 # --- Singleton Logic ---
 @st.cache_resource
 def get_manager():
-    sm = StreamManager()
+    sm = get_stream_manager()
     sm.start()
     return sm
 
 manager = get_manager()
 
+# --- Cached Analytics ---
+# Heavy math is memoized on (last bar timestamp, row count) so 1Hz reruns
+# with no new bar short-circuit instead of re-walking the history.
+@st.cache_data(ttl=2, show_spinner=False)
+def compute_hedge_ratio(_df: pd.DataFrame, mode: str, window: int, data_key):
+    """Returns (hedge_ratio or None, kalman_betas or None)."""
+    if "OLS" in mode:
+        subset = _df.iloc[-window:]
+        return FinancialMetrics.calculate_ols_hedge_ratio(subset['close_1'], subset['close_2']), None
+    if "Robust" in mode:
+        subset = _df.iloc[-window:]
+        return FinancialMetrics.calculate_robust_hedge_ratio(subset['close_1'], subset['close_2']), None
+    if "Kalman" in mode:
+        betas = FinancialMetrics.run_kalman_filter(_df['close_1'], _df['close_2'])
+        return betas.iloc[-1], betas
+    return None, None
+
+@st.cache_data(ttl=2, show_spinner=False)
+def compute_spread_z(_df: pd.DataFrame, hedge_ratio: float, window: int, data_key):
+    """
+    Returns (spread, zscore, spread_mean, spread_std) float64 ndarrays.
+    Pure ndarray arithmetic: no intermediate Series or index-alignment
+    passes on the 1Hz path.
+    """
+    c1 = _df['close_1'].to_numpy(dtype=np.float64)
+    c2 = _df['close_2'].to_numpy(dtype=np.float64)
+    spread = c1 - hedge_ratio * c2
+    spread_mean, spread_std = FinancialMetrics.rolling_mean_std_arr(spread, window)
+    zscore = (spread - spread_mean) / spread_std
+    return spread, zscore, spread_mean, spread_std
+
+@st.cache_data(ttl=2, show_spinner=False)
+def build_csv(_df: pd.DataFrame, data_key) -> bytes:
+    """CSV bytes for the download button, rebuilt only when a new bar lands."""
+    return _df.to_csv().encode()
+
+@st.cache_data(ttl=2, show_spinner=False)
+def compute_positions(_zscore: pd.Series, entry: float, exit_: float, data_key):
+    """
+    Backtest positions for the Mini Backtest tab. st.tabs renders every
+    tab body on each rerun, so the closest thing to per-tab laziness is
+    memoizing on the data key: reruns without a new bar skip the walk.
+    """
+    return FinancialMetrics.backtest_mean_reversion(_zscore, None, entry, exit_)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def compute_adf(_spread: pd.Series, data_key):
+    """ADF is the most expensive stat here; stale-by-30s is fine for a diagnostic."""
+    return FinancialMetrics.perform_adf_test(_spread)
+
+@st.cache_resource
+def build_fig_template(z_entry: float):
+    """
+    Static 3-row chart scaffold (subplots, layout, threshold lines).
+    Built once per z_entry value; each rerun only swaps the trace data
+    instead of re-running make_subplots + layout serialization.
+    """
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.08,
+                        subplot_titles=("Price Action (Dual Axis)", "Spread (Divergence)", "Z-Score (Mean Reversion)"),
+                        row_heights=[0.5, 0.25, 0.25],
+                        specs=[[{"secondary_y": True}], [{}], [{}]])
+
+    # Z Thresholds
+    fig.add_hline(y=z_entry, line_dash="dash", line_color="#FF4B4B", row=3, col=1, annotation_text="Short")
+    fig.add_hline(y=-z_entry, line_dash="dash", line_color="#00FF00", row=3, col=1, annotation_text="Long")
+    fig.add_hline(y=0, line_color="gray", row=3, col=1)
+
+    # Layout Updates for Readability
+    fig.update_layout(
+        height=800,
+        template="plotly_dark",
+        margin=dict(l=50, r=50, t=30, b=30),
+        legend=dict(orientation="h", y=1.02, xanchor="right", x=1),
+        hovermode="x unified"
+    )
+    return fig
+
 # --- Sidebar ---
 st.sidebar.title("⚡ Settings")
 
@@ -44,11 +127,11 @@ window = st.sidebar.slider("Rolling Window", 10, 200, 20)
 hedge_mode = st.sidebar.selectbox("Hedge Ratio Logis", ["Fixed (1.0)", "OLS (Rolling Window)", "Robust (Huber)", "Kalman Filter (Dynamic)", "Custom"])
 
 if hedge_mode == "Fixed (1.0)":
-    hedge_ratio = 1.0
+    manual_hedge_ratio = 1.0
 elif hedge_mode == "Custom":
-    hedge_ratio = st.sidebar.number_input("Custom Ratio", value=1.0, step=0.1)
+    manual_hedge_ratio = st.sidebar.number_input("Custom Ratio", value=1.0, step=0.1)
 else:
-    hedge_ratio = 1.0 # Placeholder, computed below
+    manual_hedge_ratio = 1.0 # Placeholder, computed inside the live block
 
 # Alerting
 st.sidebar.markdown("---")
@@ -78,191 +161,173 @@ with st.expander("📚 Guide: How to use this Dashboard", expanded=False):
     3.  **Controls**: Use the sidebar to change the "Lookback Window" (responsiveness) or the "Hedge Ratio" logic.
     """)
 
-col1, col2, col3, col4, col5 = st.columns(5)
+# The live block re-runs every second as a fragment; everything above
+# (sidebar, title, guide) only executes on genuine user interaction.
+@st.fragment(run_every=1.0)
+def live_dashboard():
+    hedge_ratio = manual_hedge_ratio
+
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-# Prices
-p1 = manager.get_latest_price(symbol_1)
-p2 = manager.get_latest_price(symbol_2)
+    # Prices
+    p1 = manager.get_latest_price(symbol_1)
+    p2 = manager.get_latest_price(symbol_2)
 
-col1.metric(f"{symbol_1.upper()}", f"{p1:.2f}")
-col2.metric(f"{symbol_2.upper()}", f"{p2:.2f}")
+    col1.metric(f"{symbol_1.upper()}", f"{p1:.2f}")
+    col2.metric(f"{symbol_2.upper()}", f"{p2:.2f}")
 
-# Data Fetching
-df1 = manager.get_bars_df('1s', symbol_1)
-df2 = manager.get_bars_df('1s', symbol_2)
-merged_df = pd.DataFrame()
+    # Data Fetching
+    df1 = manager.get_bars_df('1s', symbol_1)
+    df2 = manager.get_bars_df('1s', symbol_2)
+    merged_df = pd.DataFrame()
 
-if not df1.empty and not df2.empty:
-    df1 = df1.set_index('timestamp').sort_index()
-    df2 = df2.set_index('timestamp').sort_index()
+    if not df1.empty and not df2.empty:
+        df1 = df1.set_index('timestamp').sort_index()
+        df2 = df2.set_index('timestamp').sort_index()
     
-    # Inner join for alignment
-    merged_df = df1[['close', 'volume']].join(df2[['close', 'volume']], lsuffix='_1', rsuffix='_2', how='inner')
+        # Inner join for alignment
+        merged_df = df1[['close', 'volume']].join(df2[['close', 'volume']], lsuffix='_1', rsuffix='_2', how='inner')
     
-    # CLEANING: Filter out zeros or bad data spikes
-    merged_df = merged_df[(merged_df['close_1'] > 0) & (merged_df['close_2'] > 0)]
+        # CLEANING: Filter out zeros or bad data spikes
+        merged_df = merged_df[(merged_df['close_1'] > 0) & (merged_df['close_2'] > 0)]
     
-    # Liquidity Check
-    vol_1_ma = merged_df['volume_1'].rolling(20).mean().iloc[-1] if len(merged_df) > 0 else 0
-    vol_2_ma = merged_df['volume_2'].rolling(20).mean().iloc[-1] if len(merged_df) > 0 else 0
+        # Liquidity Check
+        vol_1_ma = merged_df['volume_1'].rolling(20).mean().iloc[-1] if len(merged_df) > 0 else 0
+        vol_2_ma = merged_df['volume_2'].rolling(20).mean().iloc[-1] if len(merged_df) > 0 else 0
     
-    # HEDGE RATIO COMPUTATION
-    if len(merged_df) > 20: 
-        if "OLS" in hedge_mode:
-            # Rolling OLS (Last Window)
-            subset = merged_df.iloc[-window:]
-            calc_beta = FinancialMetrics.calculate_ols_hedge_ratio(subset['close_1'], subset['close_2'])
-            if calc_beta: hedge_ratio = calc_beta
+        # Cache key: reruns where no new bar landed hit the memoized results
+        data_key = (symbol_1, symbol_2, merged_df.index[-1], len(merged_df)) if len(merged_df) > 0 else None
 
-        elif "Robust" in hedge_mode:
-            # Robust Regression (Last Window)
-            subset = merged_df.iloc[-window:]
-            calc_beta = FinancialMetrics.calculate_robust_hedge_ratio(subset['close_1'], subset['close_2'])
+        # HEDGE RATIO COMPUTATION
+        if len(merged_df) > 20:
+            calc_beta, kalman_betas = compute_hedge_ratio(merged_df, hedge_mode, window, data_key)
             if calc_beta: hedge_ratio = calc_beta
+            if kalman_betas is not None:
+                # Store betas for plotting if needed
+                merged_df['kalman_beta'] = kalman_betas
 
-        elif "Kalman" in hedge_mode:
-            # Full History Kalman
-            betas = FinancialMetrics.run_kalman_filter(merged_df['close_1'], merged_df['close_2'])
-            hedge_ratio = betas.iloc[-1]
-            # Store betas for plotting if needed
-            merged_df['kalman_beta'] = betas
-    
-    # Calculate Spread & Z-Score with CHOSEN hedge ratio
-    merged_df['spread'] = merged_df['close_1'] - (hedge_ratio * merged_df['close_2'])
+        # Calculate Spread & Z-Score with CHOSEN hedge ratio
+        spread, zscore, spread_mean, spread_std = compute_spread_z(merged_df, hedge_ratio, window, data_key)
+        # One positional assignment for all four columns; every tab reads the same frame
+        merged_df[['spread', 'zscore', 'spread_mean', 'spread_std']] = np.column_stack(
+            [spread, zscore, spread_mean, spread_std])
     
-    roll = merged_df['spread'].rolling(window=window)
-    merged_df['zscore'] = (merged_df['spread'] - roll.mean()) / roll.std()
-    
-    if len(merged_df) > 0:
-        curr_spread = merged_df['spread'].iloc[-1]
-        curr_z = merged_df['zscore'].iloc[-1]
+        if len(merged_df) > 0:
+            curr_spread = merged_df['spread'].iloc[-1]
+            curr_z = merged_df['zscore'].iloc[-1]
 
-        col3.metric("Spread", f"{curr_spread:.4f}")
-        col4.metric("Z-Score", f"{curr_z:.2f}", delta_color="inverse")
-        col5.metric("Hedge Ratio", f"{hedge_ratio:.4f}")
+            col3.metric("Spread", f"{curr_spread:.4f}")
+            col4.metric("Z-Score", f"{curr_z:.2f}", delta_color="inverse")
+            col5.metric("Hedge Ratio", f"{hedge_ratio:.4f}")
         
-        # Alert Logic - Non-blocking
-        if abs(curr_z) > z_entry:
-            st.toast(f"⚠️ SIGNAL: {symbol_1}/{symbol_2} Z-Score {curr_z:.2f}", icon="🚨")
+            # Alert Logic - Non-blocking
+            if abs(curr_z) > z_entry:
+                st.toast(f"⚠️ SIGNAL: {symbol_1}/{symbol_2} Z-Score {curr_z:.2f}", icon="🚨")
             
-        # --- Charts ---
+            # --- Charts ---
         
-        tab_charts, tab_backtest, tab_data = st.tabs(["Real-Time Charts", "Mini Backtest", "Feature Table"])
+            tab_charts, tab_backtest, tab_data = st.tabs(["Real-Time Charts", "Mini Backtest", "Feature Table"])
         
-        with tab_charts:
-            fig = make_subplots(rows=3, cols=1, shared_xaxes=True, 
-                                vertical_spacing=0.08,
-                                subplot_titles=("Price Action (Dual Axis)", "Spread (Divergence)", "Z-Score (Mean Reversion)"),
-                                row_heights=[0.5, 0.25, 0.25],
-                                specs=[[{"secondary_y": True}], [{}], [{}]])
-
-            # Row 1: Prices + Liquidity Bubbles? Just Lines for now.
-            fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['close_1'], name=f"{symbol_1} (L)", line=dict(color='#00F0FF', width=1.5)), row=1, col=1)
-            fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['close_2'], name=f"{symbol_2} (R)", line=dict(color='#FF00AA', width=1.5)), row=1, col=1, secondary_y=True)
-
-            # Row 2: Spread
-            fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['spread'], name="Spread", line=dict(color='#FFE600', width=1.5), fill='tozeroy', fillcolor='rgba(255, 230, 0, 0.1)'), row=2, col=1)
-
-            # Row 3: Z-Score
-            fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['zscore'], name="Z-Score", line=dict(color='white', width=1.5)), row=3, col=1)
-            
-            # Z Thresholds
-            fig.add_hline(y=z_entry, line_dash="dash", line_color="#FF4B4B", row=3, col=1, annotation_text="Short")
-            fig.add_hline(y=-z_entry, line_dash="dash", line_color="#00FF00", row=3, col=1, annotation_text="Long")
-            fig.add_hline(y=0, line_color="gray", row=3, col=1)
-
-            # Layout Updates for Readability
-            fig.update_layout(
-                height=800, 
-                template="plotly_dark", 
-                margin=dict(l=50, r=50, t=30, b=30),
-                legend=dict(orientation="h", y=1.02, xanchor="right", x=1),
-                hovermode="x unified"
-            )
-            
-            # Axis Tuning for Visualization
-            # Y1 (Price 1)
-            y1_min, y1_max = merged_df['close_1'].min(), merged_df['close_1'].max()
-            pad1 = (y1_max - y1_min) * 0.1
-            fig.update_yaxes(title_text=symbol_1.upper(), range=[y1_min - pad1, y1_max + pad1], row=1, col=1)
-            
-            # Y2 (Price 2)
-            y2_min, y2_max = merged_df['close_2'].min(), merged_df['close_2'].max()
-            pad2 = (y2_max - y2_min) * 0.1
-            fig.update_yaxes(title_text=symbol_2.upper(), range=[y2_min - pad2, y2_max + pad2], row=1, col=1, secondary_y=True)
-            
-            # Spread Axis - Auto with padding
-            s_min, s_max = merged_df['spread'].min(), merged_df['spread'].max()
-            pad_s = (s_max - s_min) * 0.1 if s_max != s_min else 1.0
-            fig.update_yaxes(title_text="Spread", range=[s_min - pad_s, s_max + pad_s], row=2, col=1)
-            
-            # Z Axis - Fixed usually better for Z, but let's auto with bounds
-            z_vals = merged_df['zscore'].dropna()
-            if not z_vals.empty:
-                z_max_abs = max(abs(z_vals.min()), abs(z_vals.max()), z_entry + 1)
-                fig.update_yaxes(title_text="Sigma", range=[-z_max_abs, z_max_abs], row=3, col=1)
+            with tab_charts:
+                fig = build_fig_template(z_entry)
+                fig.data = []
+
+                # ndarray views: traces serialize straight from these, and the
+                # axis ranges below come from single-pass nan-reductions
+                c1 = merged_df['close_1'].to_numpy()
+                c2 = merged_df['close_2'].to_numpy()
+                spread_arr = merged_df['spread'].to_numpy()
+                z_arr = merged_df['zscore'].to_numpy()
+
+                # Row 1: Prices + Liquidity Bubbles? Just Lines for now.
+                fig.add_trace(go.Scatter(x=merged_df.index, y=c1, name=f"{symbol_1} (L)", line=dict(color='#00F0FF', width=1.5)), row=1, col=1)
+                fig.add_trace(go.Scatter(x=merged_df.index, y=c2, name=f"{symbol_2} (R)", line=dict(color='#FF00AA', width=1.5)), row=1, col=1, secondary_y=True)
+
+                # Row 2: Spread
+                fig.add_trace(go.Scatter(x=merged_df.index, y=spread_arr, name="Spread", line=dict(color='#FFE600', width=1.5), fill='tozeroy', fillcolor='rgba(255, 230, 0, 0.1)'), row=2, col=1)
+
+                # Row 3: Z-Score
+                fig.add_trace(go.Scatter(x=merged_df.index, y=z_arr, name="Z-Score", line=dict(color='white', width=1.5)), row=3, col=1)
+
+                # Axis Tuning for Visualization
+                # Y1 (Price 1)
+                y1_min, y1_max = np.nanmin(c1), np.nanmax(c1)
+                pad1 = (y1_max - y1_min) * 0.1
+                fig.update_yaxes(title_text=symbol_1.upper(), range=[y1_min - pad1, y1_max + pad1], row=1, col=1)
+
+                # Y2 (Price 2)
+                y2_min, y2_max = np.nanmin(c2), np.nanmax(c2)
+                pad2 = (y2_max - y2_min) * 0.1
+                fig.update_yaxes(title_text=symbol_2.upper(), range=[y2_min - pad2, y2_max + pad2], row=1, col=1, secondary_y=True)
+
+                # Spread Axis - Auto with padding
+                s_min, s_max = np.nanmin(spread_arr), np.nanmax(spread_arr)
+                pad_s = (s_max - s_min) * 0.1 if s_max != s_min else 1.0
+                fig.update_yaxes(title_text="Spread", range=[s_min - pad_s, s_max + pad_s], row=2, col=1)
+
+                # Z Axis - Fixed usually better for Z, but let's auto with bounds
+                if np.isfinite(z_arr).any():
+                    z_max_abs = max(abs(np.nanmin(z_arr)), abs(np.nanmax(z_arr)), z_entry + 1)
+                    fig.update_yaxes(title_text="Sigma", range=[-z_max_abs, z_max_abs], row=3, col=1)
             
-            # Fix the use_container_width warning by just using the standard param (warnings are annoying but functionality usually works).
-            # If the user insists on fixing it, I will remove the param and rely on default, or use custom CSS.
-            st.plotly_chart(fig, use_container_width=True, key="main_chart")
+                # Fix the use_container_width warning by just using the standard param (warnings are annoying but functionality usually works).
+                # If the user insists on fixing it, I will remove the param and rely on default, or use custom CSS.
+                st.plotly_chart(fig, use_container_width=True, key="main_chart")
             
-            # Heatmap / Cross Corr
-            st.caption(f"Liquidity (20-bar Avg Vol): {symbol_1.upper()}: {vol_1_ma:.0f} | {symbol_2.upper()}: {vol_2_ma:.0f}")
+                # Heatmap / Cross Corr
+                st.caption(f"Liquidity (20-bar Avg Vol): {symbol_1.upper()}: {vol_1_ma:.0f} | {symbol_2.upper()}: {vol_2_ma:.0f}")
 
-        with tab_backtest:
-            st.subheader("In-Sample Mean Reversion Test")
-            positions = FinancialMetrics.backtest_mean_reversion(merged_df['zscore'], None, z_entry, z_exit)
+            with tab_backtest:
+                st.subheader("In-Sample Mean Reversion Test")
+                positions = compute_positions(merged_df['zscore'], z_entry, z_exit, data_key)
             
-            # Check if we have positions
-            if positions.abs().sum() > 0:
-                # Plot
-                bt_fig = go.Figure()
-                bt_fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['zscore'], name="Z-Score", line=dict(color='gray', width=1)))
+                # Check if we have positions
+                if positions.abs().sum() > 0:
+                    # Plot
+                    bt_fig = go.Figure()
+                    bt_fig.add_trace(go.Scatter(x=merged_df.index, y=merged_df['zscore'], name="Z-Score", line=dict(color='gray', width=1)))
                 
-                # Overlay Entries
-                longs = merged_df[positions == 1]
-                shorts = merged_df[positions == -1]
+                    # Overlay Entries
+                    longs = merged_df[positions == 1]
+                    shorts = merged_df[positions == -1]
                 
-                bt_fig.add_trace(go.Scatter(x=longs.index, y=longs['zscore'], mode='markers', name="Long Entry", marker=dict(color='#00FF00', size=10, symbol='triangle-up')))
-                bt_fig.add_trace(go.Scatter(x=shorts.index, y=shorts['zscore'], mode='markers', name="Short Entry", marker=dict(color='#FF4B4B', size=10, symbol='triangle-down')))
+                    bt_fig.add_trace(go.Scatter(x=longs.index, y=longs['zscore'], mode='markers', name="Long Entry", marker=dict(color='#00FF00', size=10, symbol='triangle-up')))
+                    bt_fig.add_trace(go.Scatter(x=shorts.index, y=shorts['zscore'], mode='markers', name="Short Entry", marker=dict(color='#FF4B4B', size=10, symbol='triangle-down')))
                 
-                bt_fig.add_hline(y=z_entry, line_dash="dash", line_color="white")
-                bt_fig.add_hline(y=-z_entry, line_dash="dash", line_color="white")
+                    bt_fig.add_hline(y=z_entry, line_dash="dash", line_color="white")
+                    bt_fig.add_hline(y=-z_entry, line_dash="dash", line_color="white")
                 
-                bt_fig.update_layout(title="Signals on Z-Score History", template="plotly_dark", height=400)
-                st.plotly_chart(bt_fig, use_container_width=True)
+                    bt_fig.update_layout(title="Signals on Z-Score History", template="plotly_dark", height=400)
+                    st.plotly_chart(bt_fig, use_container_width=True)
                 
-                st.markdown(f"**Total Signals Generated**: {positions.diff().abs().sum() / 2:.0f}")
-                st.caption("Note: This is a visual backtest on the currently loaded rolling window.")
-            else:
-                st.warning("No trades triggered with current thresholds on loaded history.")
+                    st.markdown(f"**Total Signals Generated**: {positions.diff().abs().sum() / 2:.0f}")
+                    st.caption("Note: This is a visual backtest on the currently loaded rolling window.")
+                else:
+                    st.warning("No trades triggered with current thresholds on loaded history.")
 
-        with tab_data:
-            st.subheader("Feature Engineering Table")
-            
-            # Add Rolling Features
-            merged_df['spread_mean'] = roll.mean()
-            merged_df['spread_std'] = roll.std()
+            with tab_data:
+                st.subheader("Feature Engineering Table")
             
-            # Display latest
-            st.dataframe(merged_df.sort_index(ascending=False).head(50), use_container_width=True)
+                # Stationarity check on the spread (cached, refreshed every 30s)
+                adf = compute_adf(merged_df['spread'], data_key)
+                verdict = "Stationary ✅" if adf['p_value'] < 0.05 else "Non-Stationary ⚠️"
+                st.caption(f"ADF Test: p-value {adf['p_value']:.4f} ({verdict})")
+
+                # Display latest (tail slice + flip is O(50) vs sorting a copy)
+                st.dataframe(merged_df.iloc[-50:].iloc[::-1], use_container_width=True)
             
-            # Download
-            csv_data = merged_df.to_csv()
-            st.download_button("Download Full Feature Set (CSV)", csv_data, "quant_features.csv", "text/csv")
+                # Download
+                st.download_button("Download Full Feature Set (CSV)", build_csv(merged_df, data_key),
+                                   "quant_features.csv", "text/csv")
             
-    else:
-        st.warning("Waiting for sufficient history to calculate metrics...")
-        
-else:
-    st.info("Waiting for data stream... (Ensure markets are open/active)")
+        else:
+            st.warning("Waiting for sufficient history to calculate metrics...")
         
+    else:
+        st.info("Waiting for data stream... (Ensure markets are open/active)")
 
+live_dashboard()
 
 # --- Footer ---
 st.markdown("---")
 st.caption(f"Backend Status: {'Running' if manager.thread and manager.thread.is_alive() else 'Stopped'} | Mode: {hedge_mode}")
-
-# --- Auto Rerun ---
-time.sleep(1)
-st.rerun()
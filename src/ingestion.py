@@ -4,6 +4,8 @@ import logging
 import json
 from .config import WEBSOCKET_URL
 
+logger = logging.getLogger(__name__)
+
 class BinanceClient:
     def __init__(self, symbols: list, callback):
         """
@@ -20,17 +22,17 @@ class BinanceClient:
         streams = "/".join([f"{s}@trade" for s in self.symbols])
         url = f"{WEBSOCKET_URL}/{streams}"
 
-        logging.info(f"Connecting to {url}")
-        
+        logger.info(f"Connecting to {url}")
+
         while self.running:
             try:
                 async with websockets.connect(url) as ws:
-                    logging.info("Connected to Binance")
+                    logger.info("Connected to Binance")
                     while self.running:
                         msg = await ws.recv()
                         await self.callback(msg)
             except Exception as e:
-                logging.error(f"Websocket error: {e}")
+                logger.error(f"Websocket error: {e}")
                 await asyncio.sleep(5) # Reconnect delay
 
     def stop(self):
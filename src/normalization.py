@@ -1,12 +1,31 @@
 from dataclasses import dataclass
-from datetime import datetime
-import json
 from typing import Optional
+import msgspec
+from .config import DEFAULT_SYMBOLS
 
-@dataclass
+# Uppercase wire symbol -> shared lowercase string, built once. A dict
+# hit returns the interned string with no allocation or case-folding;
+# unknown symbols fall back to .lower().
+_SYMBOL_INTERN = {s.upper(): s for s in DEFAULT_SYMBOLS}
+
+class TradeMsg(msgspec.Struct):
+    """
+    Typed view of a Binance trade/aggTrade payload — only the fields we
+    read. msgspec decodes straight into this struct, skipping the
+    intermediate dict that json.loads would build per message.
+    """
+    s: str   # symbol
+    p: str   # price
+    q: str   # quantity
+    T: int   # trade time (ms epoch)
+    e: str = ""  # event type
+
+_decoder = msgspec.json.Decoder(TradeMsg)
+
+@dataclass(slots=True)
 class Tick:
     symbol: str
-    timestamp: str  # ISO-8601
+    ts_ms: int  # ms since epoch, as delivered by Binance
     price: float
     size: float
 
@@ -15,28 +34,20 @@ class Tick:
         """
         Parses Binance AggTrade or Trade stream message.
         See: https://developers.binance.com/docs/derivatives/usds-margined-futures/websocket-market-data/aggregate-trade-streams
-        Looking for 'p' (price), 'q' (quantity), 'T' (trade time), 's' (symbol)
-        Or 'p', 'q', 'E' (event time) if using raw trade stream.
+        Looking for 'p' (price), 'q' (quantity), 'T' (trade time), 's' (symbol).
+        Messages without those fields (subscription acks etc.) are dropped.
         """
         try:
-            data = json.loads(msg)
-            # Handle standard trade or aggTrade
-            # e: event type, E: event time, s: symbol, p: price, q: quantity
-            if 'e' in data and data['e'] == 'aggTrade':
-                 ts_ms = data['T']
-            elif 'T' in data: # Trade stream
-                 ts_ms = data['T']
-            else:
-                return None 
-            
-            # Convert ms timestamp to ISO
-            iso_ts = datetime.fromtimestamp(ts_ms / 1000.0).isoformat()
-            
-            return Tick(
-                symbol=data['s'].lower(),
-                timestamp=iso_ts,
-                price=float(data['p']),
-                size=float(data['q'])
-            )
-        except Exception:
+            data = _decoder.decode(msg)
+            price = float(data.p)
+            size = float(data.q)
+        except (msgspec.DecodeError, ValueError):
+            # Not a trade payload, or non-numeric price/quantity
             return None
+
+        return Tick(
+            symbol=_SYMBOL_INTERN.get(data.s) or data.s.lower(),
+            ts_ms=data.T,
+            price=price,
+            size=size
+        )
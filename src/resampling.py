@@ -1,88 +1,102 @@
-from datetime import datetime, timedelta
-import pandas as pd
-from typing import Dict, Optional, Any
-import logging
+from typing import Dict, Any
+import numpy as np
 from .normalization import Tick
 
 class Resampler:
-    def __init__(self):
-        # State for current bars: { '1s': {'btcusdt': BarData}, '1m': ... }
-        self.current_bars: Dict[str, Dict[str, Dict[str, Any]]] = {
-            '1s': {},
-            '1m': {},
-            '5m': {}
+    # Bucket widths in ms; integer modulo on the epoch ms replaces the
+    # old datetime round-trips (fromisoformat/replace/timestamp/isoformat)
+    # that dominated per-tick CPU.
+    INTERVAL_MS = {'1s': 1_000, '1m': 60_000, '5m': 300_000}
+
+    def __init__(self, capacity: int = 16):
+        # In-flight bars are Structure-of-Arrays: one column array per
+        # field per timeframe, indexed by a small symbol id. Updating a
+        # bar is a handful of array stores, no dict allocation per bar.
+        self.symbol_idx: Dict[str, int] = {}
+        self._symbols: list = []  # id -> symbol, for emitting
+        self._cap = capacity
+        self._state: Dict[str, Dict[str, np.ndarray]] = {
+            tf: self._alloc_columns(capacity) for tf in self.INTERVAL_MS
         }
-    
-    def _get_interval_seconds(self, timeframe: str) -> int:
-        if timeframe == '1s': return 1
-        if timeframe == '1m': return 60
-        if timeframe == '5m': return 300
-        return 60
 
-    def _align_time(self, ts: datetime, timeframe: str) -> datetime:
-        """
-        Floors timestamp to the nearest interval boundary.
-        """
-        seconds = self._get_interval_seconds(timeframe)
-        timestamp = ts.replace(microsecond=0)
-        
-        # Calculate seconds since epoch part to floor correctly
-        # Easier strategy: timestamp is already ISO from Tick. 
-        # But we need datetime obj.
-        
-        # Floor logic
-        total_seconds = int(timestamp.timestamp())
-        floored_seconds = total_seconds - (total_seconds % seconds)
-        return datetime.fromtimestamp(floored_seconds)
+    @staticmethod
+    def _alloc_columns(cap: int) -> Dict[str, np.ndarray]:
+        return {
+            'ts_ms': np.full(cap, -1, dtype=np.int64),  # -1 = no bar in flight
+            'open': np.empty(cap, dtype=np.float64),
+            'high': np.empty(cap, dtype=np.float64),
+            'low': np.empty(cap, dtype=np.float64),
+            'close': np.empty(cap, dtype=np.float64),
+            'volume': np.empty(cap, dtype=np.float64),
+        }
 
-    def process_tick(self, tick: Tick) -> list[tuple[str, dict]]:
+    def _symbol_id(self, symbol: str) -> int:
+        idx = self.symbol_idx.get(symbol)
+        if idx is None:
+            idx = len(self._symbols)
+            if idx >= self._cap:
+                self._grow()
+            self.symbol_idx[symbol] = idx
+            self._symbols.append(symbol)
+        return idx
+
+    def _grow(self):
+        new_cap = self._cap * 2
+        for tf, cols in self._state.items():
+            new_cols = self._alloc_columns(new_cap)
+            for name, arr in cols.items():
+                new_cols[name][:self._cap] = arr
+            self._state[tf] = new_cols
+        self._cap = new_cap
+
+    def process_tick(self, tick: Tick) -> list[tuple[str, str, dict]]:
         """
         Ingests a tick and returns a list of COMPLETED bars to save.
-        Returns: [('1m', bar_dict), ('5m', bar_dict), ...]
+        Returns: [('1m', 'btcusdt', bar_dict), ...] — the symbol rides
+        along so consumers index their buffers without a dict lookup
+        back into the bar.
         """
         completed_bars = []
-        
-        try:
-            ts_dt = datetime.fromisoformat(tick.timestamp)
-        except ValueError:
-            return []
+        i = self._symbol_id(tick.symbol)
+        price = tick.price
+        size = tick.size
 
-        for tf in ['1s', '1m', '5m']:
-            aligned_ts = self._align_time(ts_dt, tf)
-            aligned_ts_str = aligned_ts.isoformat()
-            
-            # Check if we have an existing bar for this symbol
-            if tick.symbol in self.current_bars[tf]:
-                current_bar = self.current_bars[tf][tick.symbol]
-                
-                # If the new tick belongs to a NEW period (aligned_ts > current_bar_ts)
-                # Then the old bar is officially closed.
-                if aligned_ts_str != current_bar['timestamp']:
-                     completed_bars.append((tf, current_bar))
-                     # Start new bar
-                     self.current_bars[tf][tick.symbol] = self._new_bar(tick, aligned_ts_str)
-                else:
-                    # Update existing bar
-                    self._update_bar(current_bar, tick)
+        for tf, interval_ms in self.INTERVAL_MS.items():
+            cols = self._state[tf]
+            aligned_ms = tick.ts_ms - (tick.ts_ms % interval_ms)
+
+            if cols['ts_ms'][i] == aligned_ms:
+                # Update the in-flight bar in place
+                if price > cols['high'][i]:
+                    cols['high'][i] = price
+                if price < cols['low'][i]:
+                    cols['low'][i] = price
+                cols['close'][i] = price
+                cols['volume'][i] += size
             else:
-                # First bar ever
-                self.current_bars[tf][tick.symbol] = self._new_bar(tick, aligned_ts_str)
+                # New period: close the old bar (if any), start a new one
+                if cols['ts_ms'][i] != -1:
+                    completed_bars.append((tf, self._symbols[i], self._emit_bar(tf, i)))
+                cols['ts_ms'][i] = aligned_ms
+                cols['open'][i] = price
+                cols['high'][i] = price
+                cols['low'][i] = price
+                cols['close'][i] = price
+                cols['volume'][i] = size
 
         return completed_bars
 
-    def _new_bar(self, tick: Tick, timestamp: str) -> Dict[str, Any]:
+    def _emit_bar(self, tf: str, i: int) -> Dict[str, Any]:
+        # Materialized as a dict only on bar close (~once per interval).
+        # Timestamps stay as ms epoch ints all the way into SQLite; the
+        # UI layer converts to datetime once per DataFrame build.
+        cols = self._state[tf]
         return {
-            'symbol': tick.symbol,
-            'timestamp': timestamp,
-            'open': tick.price,
-            'high': tick.price,
-            'low': tick.price,
-            'close': tick.price,
-            'volume': tick.size
+            'symbol': self._symbols[i],
+            'timestamp': int(cols['ts_ms'][i]),
+            'open': float(cols['open'][i]),
+            'high': float(cols['high'][i]),
+            'low': float(cols['low'][i]),
+            'close': float(cols['close'][i]),
+            'volume': float(cols['volume'][i]),
         }
-
-    def _update_bar(self, bar: Dict[str, Any], tick: Tick):
-        bar['high'] = max(bar['high'], tick.price)
-        bar['low'] = min(bar['low'], tick.price)
-        bar['close'] = tick.price
-        bar['volume'] += tick.size